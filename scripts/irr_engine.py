@@ -1,10 +1,101 @@
 import os
 import sys
-import time
 import json
 import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import numpy_financial as npf
+import orjson
+
+# Column IDs for required input fields
+COL_NOI                = "numeric_mkxam1rv"
+COL_TOTAL_PROJECT_COST = "numeric_mkx8vtv"
+COL_LOAN_AMOUNT        = "numeric_mkx856za"
+COL_MARKET_CAP_RATE    = "numeric_mkxam49"
+COL_EXIT_CAP_RATE      = "numeric_mkxarhhr"
+COL_YEAR_1_CF          = "numeric_mkxary42"
+COL_EQUITY_INVESTMENT  = "numeric_mkxapdxt"
+
+# Column IDs for calculated outputs (all confirmed from your columns list)
+COL_CAP_RATE           = "numeric_mkxasdx8"
+COL_LTV                = "numeric_mkxa901y"
+COL_YIELD_ON_COST      = "numeric_mkxagcrj"
+COL_SPREAD             = "numeric_mkxa1nb4"
+COL_REVERSION_VALUE    = "numeric_mkxaacq4"
+COL_CASH_ON_CASH       = "numeric_mkxahsqj"
+COL_IRR                = "numeric_mkxav001"
+COL_EQUITY_MULTIPLE    = "numeric_mkxag7qd"
+
+# Also needed for IRR calculation
+COL_YEAR_2_CF          = "numeric_mkxavbzw"
+COL_YEAR_3_CF          = "numeric_mkxadz1f"
+COL_YEAR_4_CF          = "numeric_mkxasbp9"
+COL_YEAR_5_CF          = "numeric_mkxarrfz"
+COL_SALE_PROCEEDS      = "numeric_mkxaaxrp"
+
+# Input columns in the order main() unpacks them
+INPUT_COLUMNS = (
+    COL_NOI, COL_TOTAL_PROJECT_COST, COL_LOAN_AMOUNT, COL_MARKET_CAP_RATE, COL_EXIT_CAP_RATE,
+    COL_YEAR_1_CF, COL_EQUITY_INVESTMENT, COL_YEAR_2_CF, COL_YEAR_3_CF, COL_YEAR_4_CF,
+    COL_YEAR_5_CF, COL_SALE_PROCEEDS,
+)
+
+# Calculated columns written back; also fetched so unchanged items can be skipped
+OUTPUT_COLUMNS = (
+    COL_CAP_RATE, COL_LTV, COL_YIELD_ON_COST, COL_SPREAD, COL_REVERSION_VALUE,
+    COL_CASH_ON_CASH, COL_IRR, COL_EQUITY_MULTIPLE,
+)
+
+# Decimal number with optional sign and exponent (no separators, nan or inf),
+# checked before float() so non-numeric cells never raise
+NUMBER_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+API_URL = "https://api.monday.com/v2"
+
+# Shared session so every call to the API reuses the same keep-alive TLS connection.
+# Failed calls are retried inside the connection pool with exponential backoff.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+    ),
+))
+
+# Number of aliased mutations sent per request (keeps each call under Monday's complexity cap)
+MUTATION_BATCH_SIZE = 30
+# Concurrent update requests in flight; must not exceed the session's pool_maxsize
+MAX_WORKERS = 8
+# Items fetched per items_page / next_items_page call (the API maximum)
+ITEMS_PAGE_LIMIT = 500
+
+# Fields requested for each page of items; only the input and output columns are fetched
+ITEMS_PAGE_FIELDS = f"""
+            cursor
+            items {{
+              id
+              name
+              column_values(ids: {json.dumps(INPUT_COLUMNS + OUTPUT_COLUMNS)}) {{
+                id
+                text
+                value
+              }}
+            }}
+"""
+NEXT_ITEMS_PAGE_QUERY = f"""
+    query ($cursor: String!) {{
+      next_items_page(limit: {ITEMS_PAGE_LIMIT}, cursor: $cursor) {{{ITEMS_PAGE_FIELDS}}}
+    }}
+"""
 
 def safe_number_colval(column_value):
     """Extracts the number from a Monday.com numeric column value dict."""
@@ -12,47 +103,174 @@ def safe_number_colval(column_value):
         return 0.0
     val = column_value.get("value")
     if val:
-        try:
-            val = json.loads(val)
+        # Numeric values are a bare or quoted number, no JSON parse needed
+        val = val.strip('" ')
+        if NUMBER_RE.fullmatch(val):
             return float(val)
-        except Exception:
-            pass
     text = column_value.get("text")
+    if text:
+        text = text.replace(",", "").strip()
+        if NUMBER_RE.fullmatch(text):
+            return float(text)
+    return 0.0
+
+def select_columns(items, column_ids):
+    """Returns each item's column value dicts for column_ids, in that order (None where missing)."""
+    # Monday returns column_values in the same order for every item on a board, so
+    # find the column positions once and index into each item's list directly
+    positions = None
+    if items:
+        index = {c["id"]: i for i, c in enumerate(items[0].get("column_values", []))}
+        if all(col in index for col in column_ids):
+            positions = [index[col] for col in column_ids]
+
+    cells = []
+    for item in items:
+        cvs = item.get("column_values", [])
+        row = None
+        if positions is not None and len(cvs) > max(positions, default=-1):
+            row = [cvs[i] for i in positions]
+            if any(cv["id"] != col for cv, col in zip(row, column_ids)):
+                row = None
+        if row is None:
+            cv_dict = {c["id"]: c for c in cvs}
+            row = [cv_dict.get(col) for col in column_ids]
+        cells.append(row)
+    return cells
+
+def parse_numeric_columns(items, column_ids):
+    """Reads the given numeric columns of every item into an (N, len(column_ids)) float array.
+
+    Raw values are converted in a single NumPy cast. Cells the cast can't read the
+    way safe_number_colval would (empty values, which fall back to the text field,
+    digit separators, stray whitespace, non-numbers and non-finite results) are
+    parsed by safe_number_colval one by one, so every cell gets the same answer.
+    """
+    cells = select_columns(items, column_ids)
+    raw = np.array(
+        [[(cv or {}).get("value") or "" for cv in row] for row in cells], dtype=str
+    ).reshape(-1, len(column_ids))
+    raw = np.char.strip(raw, '" ')
+    fallback = (raw == "") | (np.char.find(raw, "_") >= 0) | (np.char.strip(raw) != raw)
+    raw[fallback] = "0"
     try:
-        return float(text.replace(",", "")) if text else 0.0
-    except Exception:
-        return 0.0
+        values = raw.astype(np.float64)
+    except ValueError:
+        values = np.zeros(raw.shape)
+        for i, row in enumerate(raw):
+            try:
+                values[i] = row.astype(np.float64)
+            except ValueError:
+                fallback[i] = True
+    fallback |= ~np.isfinite(values)
+    for i, j in zip(*np.nonzero(fallback)):
+        values[i, j] = safe_number_colval(cells[i][j])
+    return values
 
-def http_post_with_retries(url, payload, headers, max_retries=5):
-    delay = 1
-    for attempt in range(max_retries):
-        try:
-            resp = requests.post(url, json=payload, headers=headers)
-            resp.raise_for_status()
-            return resp
-        except Exception as e:
-            if attempt < max_retries-1:
-                time.sleep(delay)
-                delay *= 2
-            else:
-                raise RuntimeError(f"HTTP request failed after {max_retries} attempts: {e}")
+def read_items_page(items):
+    """Reduces a page of items to their ids, parsed input array and current output value strings."""
+    item_ids = [item["id"] for item in items]
+    inputs = parse_numeric_columns(items, INPUT_COLUMNS)
+    # Output values as the same strings this script writes, for skipping unchanged items
+    current_outputs = [
+        {col: ((cv or {}).get("value") or "").strip('"') for col, cv in zip(OUTPUT_COLUMNS, row)}
+        for row in select_columns(items, OUTPUT_COLUMNS)
+    ]
+    return item_ids, inputs, current_outputs
 
-def main():
-    api_key = os.getenv("MONDAY_API_KEY")
-    board_id = os.getenv("MONDAY_BOARD_ID")
-    dry_run = os.getenv("DRY_RUN") == "1"
-    group_id = "group_mkx8xn8e"  # Underwriting Engine group
+def irr_batch(cashflows, guess=0.1, max_iter=50, tol=1e-9):
+    """IRRs for an (N, 6) array of cashflows, one Newton-Raphson iteration over all rows at once.
 
-    if not api_key:
-        raise RuntimeError("MONDAY_API_KEY is not set in the environment.")
-    if not board_id:
-        raise RuntimeError("MONDAY_BOARD_ID is not set in the environment.")
+    Solves each NPV polynomial in x = 1 / (1 + r) with Horner's rule, which is far
+    cheaper than numpy_financial.irr's eigenvalue-based np.roots for a fixed degree.
+    Newton only runs on rows whose cashflows change sign exactly once: by Descartes'
+    rule of signs those have a single positive root in x, so it is the only IRR. Rows
+    with several sign changes, or that do not converge, go to npf.irr so the chosen
+    root stays the same. Rows with no equity or no later cashflows (common while a
+    deal is still being entered) are NaN without solving.
+    """
+    # Deals built from the same pro-forma share cashflows; solve each distinct row once
+    unique_rows, inverse = np.unique(cashflows, axis=0, return_inverse=True)
+    if len(unique_rows) < len(cashflows):
+        return irr_batch(unique_rows, guess, max_iter, tol)[inverse.reshape(-1)]
 
-    headers = {
-        "Authorization": api_key,
-        "Content-Type": "application/json",
-    }
+    irrs = np.full(len(cashflows), np.nan)
+    # Non-finite cashflows (e.g. a cell holding 1e400) are left as NaN; np.roots
+    # in the npf.irr fallback raises on them
+    solvable = (
+        np.isfinite(cashflows).all(axis=1)
+        & (cashflows[:, 0] < 0)
+        & (cashflows[:, 1:] != 0).any(axis=1)
+    )
+
+    # Count sign changes, carrying the previous sign across zero cashflows
+    signs = np.sign(cashflows)
+    for j in range(1, signs.shape[1]):
+        signs[:, j] = np.where(signs[:, j] == 0, signs[:, j - 1], signs[:, j])
+    sign_changes = (signs[:, 1:] != signs[:, :-1]).sum(axis=1)
+
+    newton_rows = np.flatnonzero(solvable & (sign_changes == 1))
+    cf0, cf1, cf2, cf3, cf4, cf5 = cashflows[newton_rows].T
+    x = np.full(len(newton_rows), 1.0 / (1.0 + guess))
+    converged = np.zeros(len(newton_rows), dtype=bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for _ in range(max_iter):
+            if converged.all():
+                break
+            npv = cf0 + x * (cf1 + x * (cf2 + x * (cf3 + x * (cf4 + x * cf5))))
+            d_npv = cf1 + x * (2 * cf2 + x * (3 * cf3 + x * (4 * cf4 + x * 5 * cf5)))
+            step = npv / d_npv
+            # Keep x = 1 / (1 + r) positive
+            step = np.where(step >= x, x / 2, step)
+            step[converged] = 0.0
+            x -= step
+            converged |= np.abs(step) < tol * x * x
+        irrs[newton_rows] = np.where(converged, 1.0 / x - 1.0, np.nan)
+    newton_solved = np.zeros(len(cashflows), dtype=bool)
+    newton_solved[newton_rows[converged]] = True
+    for i in np.flatnonzero(solvable & ~newton_solved):
+        irrs[i] = npf.irr(cashflows[i])
+    return irrs
+
+def http_post_with_retries(url, payload):
+    """Posts a JSON payload; retries with backoff are handled by the session's adapter."""
+    # Content-Type is already set on the session
+    resp = SESSION.post(url, data=orjson.dumps(payload))
+    resp.raise_for_status()
+    return resp
+
+@lru_cache(maxsize=None)
+def batch_mutation_query(size):
+    """Parameterized GraphQL mutation updating `size` items, shared by every batch of that size."""
+    params = ", ".join(f"$id{i}: ID!, $cv{i}: JSON!" for i in range(size))
+    fields = "\n".join(
+        f"  m{i}: change_multiple_column_values(item_id: $id{i}, board_id: $bid, column_values: $cv{i}) {{ id }}"
+        for i in range(size)
+    )
+    return f"mutation ($bid: ID!, {params}) {{\n{fields}\n}}"
+
+def build_batch_mutation(board_id, updates):
+    """Builds the query/variables payload for a batch of (item_id, column_values_str) pairs."""
+    variables = {"bid": board_id}
+    for i, (item_id, column_values_str) in enumerate(updates):
+        variables[f"id{i}"] = item_id
+        variables[f"cv{i}"] = column_values_str
+    return {"query": batch_mutation_query(len(updates)), "variables": variables}
 
+def send_update_batch(board_id, batch):
+    """Posts one batch of updates, reporting failures instead of raising."""
+    update_payload = build_batch_mutation(board_id, batch)
+    item_ids = ", ".join(str(item_id) for item_id, _ in batch)
+    try:
+        update_resp = http_post_with_retries(API_URL, update_payload)
+        update_data = orjson.loads(update_resp.content)
+        if "errors" in update_data:
+            print(f"Error updating items {item_ids}: {update_data['errors']}")
+    except Exception as e:
+        print(f"Error updating items {item_ids}: {e}")
+
+def fetch_group_items_page(board_id, group_id, debug=False):
+    """Fetches the first items page of the group, or None if the group or its items are missing."""
     # Query only for items in the specified group, using items_page!
     query = f"""
     query {{
@@ -60,136 +278,142 @@ def main():
         groups(ids: ["{group_id}"]) {{
           id
           title
-          items_page(limit: 100) {{
-            items {{
-              id
-              name
-              column_values {{
-                id
-                text
-                value
-                type
-              }}
-            }}
-          }}
+          items_page(limit: {ITEMS_PAGE_LIMIT}) {{{ITEMS_PAGE_FIELDS}}}
         }}
       }}
     }}
     """
-    resp = http_post_with_retries("https://api.monday.com/v2", {"query": query}, headers)
-    data = resp.json()
-    print("DEBUG: Board ID used:", board_id)
-    print("DEBUG: Group ID used:", group_id)
-    print("DEBUG: API response:", json.dumps(data, indent=2))
+    resp = http_post_with_retries(API_URL, {"query": query})
+    data = orjson.loads(resp.content)
+    if debug:
+        print("DEBUG: API response:", json.dumps(data, indent=2))
     boards = data.get("data", {}).get("boards", [])
     if not boards or "groups" not in boards[0] or not boards[0]["groups"]:
         print("No groups returned, or group missing.")
-        return
+        return None
     group = boards[0]["groups"][0]
     if "items_page" not in group or "items" not in group["items_page"]:
         print("No items returned for group.")
+        return None
+    return group["items_page"]
+
+def fetch_next_items_page(cursor, debug=False):
+    """Fetches the items page after `cursor`, or None if the API reports an error."""
+    resp = http_post_with_retries(
+        API_URL,
+        {"query": NEXT_ITEMS_PAGE_QUERY, "variables": {"cursor": cursor}}
+    )
+    data = orjson.loads(resp.content)
+    if debug:
+        print("DEBUG: API response:", json.dumps(data, indent=2))
+    if "errors" in data:
+        print(f"Error fetching next items page: {data['errors']}")
+        return None
+    return data.get("data", {}).get("next_items_page") or {}
+
+def main():
+    api_key = os.getenv("MONDAY_API_KEY")
+    board_id = os.getenv("MONDAY_BOARD_ID")
+    dry_run = os.getenv("DRY_RUN") == "1"
+    debug = os.getenv("DEBUG") == "1"  # dump full API payloads
+    group_id = "group_mkx8xn8e"  # Underwriting Engine group
+
+    if not api_key:
+        raise RuntimeError("MONDAY_API_KEY is not set in the environment.")
+    if not board_id:
+        raise RuntimeError("MONDAY_BOARD_ID is not set in the environment.")
+
+    SESSION.headers.update({
+        "Authorization": api_key,
+        "Content-Type": "application/json",
+    })
+
+    print("DEBUG: Board ID used:", board_id)
+    print("DEBUG: Group ID used:", group_id)
+    page = fetch_group_items_page(board_id, group_id, debug)
+    if page is None:
         return
-    items = group["items_page"]["items"]
-
-    # Column IDs for required input fields
-    COL_NOI                = "numeric_mkxam1rv"
-    COL_TOTAL_PROJECT_COST = "numeric_mkx8vtv"
-    COL_LOAN_AMOUNT        = "numeric_mkx856za"
-    COL_MARKET_CAP_RATE    = "numeric_mkxam49"
-    COL_EXIT_CAP_RATE      = "numeric_mkxarhhr"
-    COL_YEAR_1_CF          = "numeric_mkxary42"
-    COL_EQUITY_INVESTMENT  = "numeric_mkxapdxt"
-
-    # Column IDs for calculated outputs (all confirmed from your columns list)
-    COL_CAP_RATE           = "numeric_mkxasdx8"
-    COL_LTV                = "numeric_mkxa901y"
-    COL_YIELD_ON_COST      = "numeric_mkxagcrj"
-    COL_SPREAD             = "numeric_mkxa1nb4"
-    COL_REVERSION_VALUE    = "numeric_mkxaacq4"
-    COL_CASH_ON_CASH       = "numeric_mkxahsqj"
-    COL_IRR                = "numeric_mkxav001"
-    COL_EQUITY_MULTIPLE    = "numeric_mkxag7qd"
-
-    # Also needed for IRR calculation
-    COL_YEAR_2_CF          = "numeric_mkxavbzw"
-    COL_YEAR_3_CF          = "numeric_mkxadz1f"
-    COL_YEAR_4_CF          = "numeric_mkxasbp9"
-    COL_YEAR_5_CF          = "numeric_mkxarrfz"
-    COL_SALE_PROCEEDS      = "numeric_mkxaaxrp"
 
-    for item in items:
-        cv_dict = {c["id"]: c for c in item.get("column_values", [])}
-        try:
-            # Read all required inputs
-            noi = safe_number_colval(cv_dict.get(COL_NOI))
-            total_project_cost = safe_number_colval(cv_dict.get(COL_TOTAL_PROJECT_COST))
-            loan_amount = safe_number_colval(cv_dict.get(COL_LOAN_AMOUNT))
-            market_cap_rate = safe_number_colval(cv_dict.get(COL_MARKET_CAP_RATE))
-            exit_cap_rate = safe_number_colval(cv_dict.get(COL_EXIT_CAP_RATE))
-            year_1_cf = safe_number_colval(cv_dict.get(COL_YEAR_1_CF))
-            equity_investment = abs(safe_number_colval(cv_dict.get(COL_EQUITY_INVESTMENT)))
-            y2 = safe_number_colval(cv_dict.get(COL_YEAR_2_CF))
-            y3 = safe_number_colval(cv_dict.get(COL_YEAR_3_CF))
-            y4 = safe_number_colval(cv_dict.get(COL_YEAR_4_CF))
-            y5 = safe_number_colval(cv_dict.get(COL_YEAR_5_CF))
-            sale = safe_number_colval(cv_dict.get(COL_SALE_PROCEEDS))
-
-            # Calculations
-            cap_rate = (noi / total_project_cost * 100) if total_project_cost > 0 else None
-            ltv = (loan_amount / total_project_cost * 100) if total_project_cost > 0 else None
-            yield_on_cost = (noi / total_project_cost * 100) if total_project_cost > 0 else None
-            spread = (yield_on_cost - market_cap_rate) if yield_on_cost is not None and market_cap_rate > 0 else None
-            reversion_value = (noi / (exit_cap_rate / 100)) if exit_cap_rate > 0 else None
-            cash_on_cash = (year_1_cf / equity_investment * 100) if equity_investment > 0 else None
-
-            # IRR/Equity Multiple as before
-            cashflows = [-equity_investment, year_1_cf, y2, y3, y4, y5 + sale]
-            irr = npf.irr(cashflows)
-            irr_value = None if irr is None or (isinstance(irr, float) and math.isnan(irr)) else irr*100.0
-            em = sum(cashflows[1:]) / equity_investment if equity_investment > 0 else None
-
-            # Build column_values for mutation
-            column_values = {}
-            if cap_rate is not None:
-                column_values[COL_CAP_RATE] = f"{cap_rate:.2f}"
-            if ltv is not None:
-                column_values[COL_LTV] = f"{ltv:.2f}"
-            if yield_on_cost is not None:
-                column_values[COL_YIELD_ON_COST] = f"{yield_on_cost:.2f}"
-            if spread is not None:
-                column_values[COL_SPREAD] = f"{spread:.2f}"
-            if reversion_value is not None:
-                column_values[COL_REVERSION_VALUE] = f"{reversion_value:.2f}"
-            if cash_on_cash is not None:
-                column_values[COL_CASH_ON_CASH] = f"{cash_on_cash:.2f}"
-            if irr_value is not None:
-                column_values[COL_IRR] = f"{irr_value:.2f}"
-            if em is not None:
-                column_values[COL_EQUITY_MULTIPLE] = f"{em:.2f}"
-
-            column_values_str = json.dumps(column_values)
-            update_mutation = f"""
-            mutation {{
-              change_multiple_column_values(item_id: {item['id']}, board_id: {board_id}, column_values: {json.dumps(column_values_str)}) {{
-                id
-              }}
-            }}
-            """
-
-            if dry_run:
-                print(f"\nWould update item {item['name']} ({item['id']}):\n{update_mutation}")
-            else:
-                update_resp = http_post_with_retries(
-                    "https://api.monday.com/v2",
-                    {"query": update_mutation},
-                    headers
-                )
-                update_data = update_resp.json()
-                if "errors" in update_data:
-                    print(f"Error updating item {item.get('name')} ({item.get('id')}): {update_data['errors']}")
-
-        except Exception as e:
-            print(f"Error on {item.get('name')}: {e}")
+    # Reduce each page to ids, parsed inputs and current outputs as it arrives.
+    # The fetch helpers keep each raw response local, so only one page of JSON
+    # is held at a time.
+    item_ids = []
+    input_pages = []
+    current_outputs = []
+    while page is not None:
+        page_ids, page_inputs, page_outputs = read_items_page(page.get("items", []))
+        item_ids.extend(page_ids)
+        input_pages.append(page_inputs)
+        current_outputs.extend(page_outputs)
+
+        # Follow the cursor until the group is exhausted, releasing the processed
+        # page before the next one is fetched and decoded
+        cursor = page.get("cursor")
+        page = None
+        if cursor:
+            page = fetch_next_items_page(cursor, debug)
+
+    inputs = np.vstack(input_pages)
+    (noi, total_project_cost, loan_amount, market_cap_rate, exit_cap_rate,
+     year_1_cf, equity_investment, y2, y3, y4, y5, sale) = inputs.T
+    equity_investment = np.abs(equity_investment)
+
+    # Calculations for all items at once; NaN marks a metric that can't be computed
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cap_rate = np.where(total_project_cost > 0, noi / total_project_cost * 100, np.nan)
+        ltv = np.where(total_project_cost > 0, loan_amount / total_project_cost * 100, np.nan)
+        yield_on_cost = np.where(total_project_cost > 0, noi / total_project_cost * 100, np.nan)
+        spread = np.where(market_cap_rate > 0, yield_on_cost - market_cap_rate, np.nan)
+        reversion_value = np.where(exit_cap_rate > 0, noi / (exit_cap_rate / 100), np.nan)
+        cash_on_cash = np.where(equity_investment > 0, year_1_cf / equity_investment * 100, np.nan)
+
+        # IRR/Equity Multiple
+        cashflows = np.column_stack([-equity_investment, year_1_cf, y2, y3, y4, y5 + sale])
+        irr = irr_batch(cashflows) * 100.0
+        em = np.where(equity_investment > 0, (year_1_cf + y2 + y3 + y4 + (y5 + sale)) / equity_investment, np.nan)
+
+    # One row per item, in OUTPUT_COLUMNS order
+    outputs = np.column_stack([
+        cap_rate, ltv, yield_on_cost, spread, reversion_value, cash_on_cash, irr, em,
+    ]).tolist()
+
+    updates = []
+    unchanged = 0
+    nothing_to_write = 0
+    finite_inputs = np.isfinite(inputs).all(axis=1).tolist()
+    for item_id, row, current, finite in zip(item_ids, outputs, current_outputs, finite_inputs):
+        if not finite:
+            print(f"Error on item {item_id}: non-finite input value")
+            continue
+        # Build column_values for mutation
+        column_values = {col: f"{value:.2f}" for col, value in zip(OUTPUT_COLUMNS, row) if not math.isnan(value)}
+        if not column_values:
+            nothing_to_write += 1
+            continue
+        # Skip the write when the board already holds these values
+        if all(current[col] == value for col, value in column_values.items()):
+            unchanged += 1
+            continue
+        updates.append((item_id, orjson.dumps(column_values).decode()))
+
+    print(
+        f"{len(updates)} items to update, {unchanged} already up to date, "
+        f"{nothing_to_write} with no computable outputs."
+    )
+
+    batches = [updates[start:start + MUTATION_BATCH_SIZE] for start in range(0, len(updates), MUTATION_BATCH_SIZE)]
+    if dry_run:
+        for batch in batches:
+            batch_ids = ", ".join(str(item_id) for item_id, _ in batch)
+            print(f"\nWould update items {batch_ids}")
+            if debug:
+                print(json.dumps(build_batch_mutation(board_id, batch), indent=2))
+    elif len(batches) == 1:
+        # A single batch needs no thread pool
+        send_update_batch(board_id, batches[0])
+    elif batches:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(batches))) as executor:
+            list(executor.map(lambda batch: send_update_batch(board_id, batch), batches))
 
 if __name__ == "__main__":
     main()